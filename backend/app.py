@@ -23,6 +23,9 @@ else:
 
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")  # optional
 
+# WAQI API host - point at waqi_stub.py for offline runs and load tests
+WAQI_BASE_URL = os.getenv("WAQI_BASE_URL", "https://api.waqi.info").rstrip("/")
+
 @app.route("/health")
 def health():
     """
@@ -49,7 +52,7 @@ def aqi():
 
     try:
         # WAQI city feed API
-        url = f"https://api.waqi.info/feed/{city}/?token={WAQI_TOKEN}"
+        url = f"{WAQI_BASE_URL}/feed/{city}/?token={WAQI_TOKEN}"
         r = requests.get(url, timeout=10)
         data = r.json()
 
@@ -360,7 +363,7 @@ def chat():
             for city in cities:
                 try:
                     # Fetch real AQI data from WAQI API
-                    url = f"https://api.waqi.info/feed/{city}/?token={WAQI_TOKEN}"
+                    url = f"{WAQI_BASE_URL}/feed/{city}/?token={WAQI_TOKEN}"
                     response = requests.get(url, timeout=5)
                     data = response.json()
                     
@@ -504,7 +507,7 @@ def get_stations():
         return jsonify({"error": "WAQI_TOKEN not configured in .env"}), 500
     
     # Bounding box for India
-    url = f"https://api.waqi.info/map/bounds/?latlng=8,68,37,97&token={WAQI_TOKEN}"
+    url = f"{WAQI_BASE_URL}/map/bounds/?latlng=8,68,37,97&token={WAQI_TOKEN}"
     
     try:
         r = requests.get(url, timeout=10)
@@ -545,7 +548,7 @@ def aqi_station():
     if not WAQI_TOKEN:
         return jsonify({"error": "WAQI_TOKEN not configured in .env"}), 500
     
-    url = f"https://api.waqi.info/feed/@{uid}/?token={WAQI_TOKEN}"
+    url = f"{WAQI_BASE_URL}/feed/@{uid}/?token={WAQI_TOKEN}"
     
     try:
         r = requests.get(url, timeout=10)
@@ -586,7 +589,7 @@ def search_cities():
     
     try:
         # WAQI search API
-        url = f"https://api.waqi.info/search/?token={WAQI_TOKEN}&keyword={keyword}"
+        url = f"{WAQI_BASE_URL}/search/?token={WAQI_TOKEN}&keyword={keyword}"
         r = requests.get(url, timeout=10)
         data = r.json()
 
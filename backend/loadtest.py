@@ -0,0 +1,309 @@
+# loadtest.py
+"""
+End-to-end load test for the backend.
+
+Drives /aqi, /chat, /stations, /search_cities and /predict at a fixed
+concurrency and reports p50/p95/p99 latency and throughput per endpoint.
+By default it starts waqi_stub.py and the backend itself, so no WAQI
+token or network access is needed.
+
+  python loadtest.py                                  # run, compare to baseline if present
+  python loadtest.py --save-baseline                  # run and record benchmarks/baseline.json
+  python loadtest.py --backend-url http://127.0.0.1:5000 --scenarios aqi,chat
+
+Exits with status 1 if any endpoint regressed past --tolerance compared
+to the baseline.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "benchmarks", "baseline.json")
+
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Kolkata", "Chennai", "Hyderabad", "Pune", "Lucknow"]
+SEARCH_KEYWORDS = ["mum", "del", "ben", "kol", "che", "hyd", "pun", "luc"]
+CHAT_MESSAGES = [
+    "What's the AQI in Delhi?",
+    "air quality in mumbai",
+    "What is PM2.5?",
+    "Should I go outside?",
+    "How to protect from pollution?",
+]
+PREDICT_PAYLOADS = [
+    {"aqi": 42, "pm2_5": 12, "temp": 24, "age": 28, "asthma": 0},
+    {"aqi": 135, "pm2_5": 60, "temp": 31, "age": 67, "asthma": 1},
+    {"aqi": 320, "pm2_5": 180, "temp": 18, "age": 9, "asthma": 0},
+]
+
+# Each scenario maps a request number to (method, path, requests kwargs)
+SCENARIOS = {
+    "aqi": lambda i: ("GET", "/aqi", {"params": {"city": CITIES[i % len(CITIES)]}}),
+    "chat": lambda i: ("POST", "/chat", {"json": {
+        "message": CHAT_MESSAGES[i % len(CHAT_MESSAGES)],
+        "userProfile": {"age": 40, "asthma": i % 2, "location": CITIES[i % len(CITIES)]},
+    }}),
+    "stations": lambda i: ("GET", "/stations", {}),
+    "search_cities": lambda i: ("GET", "/search_cities", {"params": {"keyword": SEARCH_KEYWORDS[i % len(SEARCH_KEYWORDS)]}}),
+    "predict": lambda i: ("POST", "/predict", {"json": PREDICT_PAYLOADS[i % len(PREDICT_PAYLOADS)]}),
+}
+
+LATENCY_KEYS = ["p50_ms", "p95_ms", "p99_ms"]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, proc, timeout=30):
+    """Poll url until it answers, failing early if the process died."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Process exited with code {proc.returncode} before {url} came up")
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def start_servers(args):
+    """Start waqi_stub.py and the backend pointed at it. Returns (backend_url, processes)."""
+    stub_port = free_port()
+    backend_port = free_port()
+    procs = []
+
+    stub_cmd = [
+        sys.executable, "waqi_stub.py",
+        "--port", str(stub_port),
+        "--latency", str(args.stub_latency),
+        "--jitter", str(args.stub_jitter),
+        "--error-rate", str(args.stub_error_rate),
+        "--seed", "42",
+    ]
+    stub = subprocess.Popen(stub_cmd, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    procs.append(stub)
+
+    env = dict(os.environ)
+    env.update({
+        "PORT": str(backend_port),
+        "WAQI_BASE_URL": f"http://127.0.0.1:{stub_port}",
+        "WAQI_TOKEN": "stub",
+    })
+    if args.server == "gunicorn":
+        backend_cmd = [sys.executable, "-m", "gunicorn", "-w", str(args.workers), "--threads", str(args.threads),
+                       "-b", f"127.0.0.1:{backend_port}", "app:app"]
+    else:
+        backend_cmd = [sys.executable, "app.py"]
+    backend = subprocess.Popen(backend_cmd, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    procs.append(backend)
+
+    try:
+        wait_for(f"http://127.0.0.1:{stub_port}/search/?token=stub&keyword=", stub)
+        wait_for(f"http://127.0.0.1:{backend_port}/health", backend)
+    except Exception:
+        stop_servers(procs)
+        raise
+
+    return f"http://127.0.0.1:{backend_port}", procs
+
+
+def stop_servers(procs):
+    for proc in procs:
+        proc.terminate()
+    for proc in procs:
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def run_scenario(base_url, name, total, concurrency, warmup, timeout):
+    """Fire `total` requests for one scenario across `concurrency` workers."""
+    build_request = SCENARIOS[name]
+    local = threading.local()
+
+    def send(i):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        method, path, kwargs = build_request(i)
+        start = time.perf_counter()
+        try:
+            r = local.session.request(method, base_url + path, timeout=timeout, **kwargs)
+            ok = r.status_code < 400
+        except requests.RequestException:
+            ok = False
+        return (time.perf_counter() - start) * 1000.0, ok
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(warmup)))
+
+        started = time.perf_counter()
+        results = list(pool.map(send, range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4),
+        "mean_ms": round(sum(latencies) / total, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "throughput_rps": round(total / elapsed, 2),
+    }
+
+
+def print_report(results):
+    header = f"{'endpoint':<15}{'reqs':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results["scenarios"].items():
+        print(f"{name:<15}{r['requests']:>7}{r['errors']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['p99_ms']:>10.1f}{r['throughput_rps']:>10.1f}")
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """
+    Compare a run against a saved baseline. Returns a list of regression messages.
+
+    Latency regresses when it is more than `tolerance` slower AND at least
+    `min_delta_ms` slower (so sub-millisecond noise on fast endpoints is ignored).
+    Throughput regresses when it drops by more than `tolerance`.
+    Error rate regresses when it rises by more than one percentage point.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+
+        for key in LATENCY_KEYS:
+            if current[key] > base[key] * (1 + tolerance) and current[key] - base[key] >= min_delta_ms:
+                regressions.append(f"{name}: {key} {base[key]:.1f} -> {current[key]:.1f}")
+
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {base['throughput_rps']:.1f} -> {current['throughput_rps']:.1f}")
+
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{name}: error_rate {base['error_rate']:.2%} -> {current['error_rate']:.2%}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Swasthya Vayu backend")
+    parser.add_argument("--backend-url", help="test an already running backend instead of starting one")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--timeout", type=float, default=15, help="per-request timeout in seconds")
+    parser.add_argument("--server", choices=["flask", "gunicorn"], default="flask",
+                        help="how to start the backend when --backend-url is not given")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--stub-latency", type=float, default=50, help="WAQI stub base latency in ms")
+    parser.add_argument("--stub-jitter", type=float, default=20, help="WAQI stub latency jitter in ms")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="WAQI stub failure fraction (0-1)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before failing")
+    parser.add_argument("--min-delta-ms", type=float, default=5, help="ignore latency increases smaller than this")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    if args.concurrency < 1 or args.requests < 1:
+        parser.error("--concurrency and --requests must be at least 1")
+
+    procs = []
+    base_url = args.backend_url
+    if not base_url:
+        base_url, procs = start_servers(args)
+    base_url = base_url.rstrip("/")
+
+    try:
+        results = {
+            "meta": {
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "stub_latency_ms": None if args.backend_url else args.stub_latency,
+                "server": "external" if args.backend_url else args.server,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "scenarios": {},
+        }
+        for name in names:
+            print(f"Running {name} ({args.requests} requests, concurrency {args.concurrency})...")
+            results["scenarios"][name] = run_scenario(
+                base_url, name, args.requests, args.concurrency, args.warmup, args.timeout
+            )
+    finally:
+        stop_servers(procs)
+
+    print()
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline} - run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    base_meta = baseline.get("meta", {})
+    changed = [k for k in ("concurrency", "requests", "stub_latency_ms", "server") if base_meta.get(k) != results["meta"][k]]
+    if changed:
+        print(f"\nWarning: baseline was recorded with different settings ({', '.join(changed)}).")
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\nPerformance regressions vs {args.baseline}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\nNo regressions vs {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# waqi_stub.py
+"""
+Offline stand-in for the WAQI API (api.waqi.info).
+
+Replays the recorded responses in fixtures/waqi/ for the three endpoints
+the backend uses:
+  GET /feed/<city>/        -> fixtures/waqi/feed.json (keyed by lowercase city)
+  GET /feed/@<uid>/        -> same fixtures, looked up by station uid
+  GET /map/bounds/         -> fixtures/waqi/map_bounds.json
+  GET /search/?keyword=..  -> fixtures/waqi/search.json (filtered by keyword)
+
+Run it and point the backend at it:
+  python waqi_stub.py --port 5055 --latency 80 --jitter 40 --error-rate 0.02
+  WAQI_BASE_URL=http://127.0.0.1:5055 WAQI_TOKEN=stub python app.py
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from flask import Flask, request, jsonify
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "waqi")
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """Load feed, map bounds and search fixtures from disk."""
+    def read(name):
+        with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+            return json.load(f)
+
+    feeds = {city.lower(): body for city, body in read("feed.json").items()}
+    return {
+        "feeds": feeds,
+        "feeds_by_uid": {str(body["data"]["idx"]): body for body in feeds.values()},
+        "map_bounds": read("map_bounds.json"),
+        "search": read("search.json"),
+    }
+
+
+def create_app(fixtures=None, latency_ms=0, jitter_ms=0, error_rate=0.0,
+               error_mode="http", seed=None):
+    """
+    Build the stub Flask app.
+
+    latency_ms / jitter_ms: every response is delayed by
+        latency_ms + uniform(-jitter_ms, jitter_ms) milliseconds (never negative)
+    error_rate: fraction of requests (0-1) that fail instead of replaying a fixture
+    error_mode: "http" returns a 502 with a non-JSON body (upstream outage),
+        "quota" returns WAQI's own {"status": "error", "data": "Over quota"}
+    """
+    fixtures = fixtures or load_fixtures()
+    rng = random.Random(seed)
+    stub = Flask(__name__)
+
+    @stub.before_request
+    def inject_latency_and_errors():
+        delay = latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if error_rate and rng.random() < error_rate:
+            if error_mode == "quota":
+                return jsonify({"status": "error", "data": "Over quota"})
+            return "<html><body>502 Bad Gateway</body></html>", 502, {"Content-Type": "text/html"}
+
+        # WAQI rejects requests without a token
+        if not request.args.get("token"):
+            return jsonify({"status": "error", "data": "Invalid key"})
+
+    @stub.route("/feed/<path:city>/")
+    def feed(city):
+        if city.startswith("@"):
+            body = fixtures["feeds_by_uid"].get(city[1:])
+        else:
+            body = fixtures["feeds"].get(city.strip().lower())
+
+        if body is None:
+            return jsonify({"status": "error", "data": "Unknown station"})
+        return jsonify(body)
+
+    @stub.route("/map/bounds/")
+    def map_bounds():
+        return jsonify(fixtures["map_bounds"])
+
+    @stub.route("/search/")
+    def search():
+        keyword = request.args.get("keyword", "").strip().lower()
+        results = fixtures["search"]
+        matches = [s for s in results.get("data", []) if keyword in s["station"]["name"].lower()]
+        return jsonify({"status": results.get("status", "ok"), "data": matches})
+
+    return stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline WAQI API replay stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("WAQI_STUB_PORT", 5055)))
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory with feed/map_bounds/search JSON")
+    parser.add_argument("--latency", type=float, default=0, help="base response delay in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="random +/- delay added to --latency, in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests to fail (0-1)")
+    parser.add_argument("--error-mode", choices=["http", "quota"], default="http")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible latency/error injection")
+    args = parser.parse_args()
+
+    if not 0 <= args.error_rate <= 1:
+        parser.error("--error-rate must be between 0 and 1")
+
+    stub = create_app(
+        fixtures=load_fixtures(args.fixtures),
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        error_mode=args.error_mode,
+        seed=args.seed,
+    )
+    stub.run(host=args.host, port=args.port, debug=False, threaded=True)
+
+
+if __name__ == "__main__":
+    main()